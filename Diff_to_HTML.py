@@ -3,191 +3,355 @@ import subprocess
 import re
 import sys
 import html
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pygit2 #İsteğe bağlı: kuruluysa git komutları yerine libgit2 ile repoya doğrudan erişilir
+except ImportError:
+    pygit2 = None
 
 number_of_previous_rows = 3 #Her farklılık bloğundan önce ve sonra yazdırılacak satır sayısını ifade eder
-oneArgument = False #Sourcetree üzerinde seçilen argüman sayısını kontrol eden boolean ifade
+source_extensions = ('.c', '.h', '.py') #Farklılıkları yazdırılacak dosya uzantıları
+repository = None #pygit2 kuruluysa program boyunca açık tutulan repo nesnesi
+
+#Düzenli ifadeler modül yüklenirken bir kez derlenir
+function_name_pattern = re.compile(r'^@@.*?@@[ \t]*(?:def|function)\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.M)
+hunk_header_pattern = re.compile(r'^@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@')
+quoted_name_pattern = re.compile(rb'"((?:[^"\\]|\\.)*)"')
+quoted_escape_pattern = re.compile(rb'\\([0-7]{3}|.)')
+
+#git'in C tarzı tırnaklamada kullandığı kaçış karakterleri
+c_quote_escapes = {b'a': b'\a', b'b': b'\b', b't': b'\t', b'n': b'\n', b'v': b'\v', b'f': b'\f', b'r': b'\r', b'"': b'"', b'\\': b'\\'}
 
-#bir git fonksiyonu olan diff fonksiyonunu kullanarak iki versiyon arasındaki farklılıkları tespit eder
-def get_git_diff(commit1, commit2, repo_path, file_name):
+#Tabloya yazdırılmayan diff başlık satırları; önce ilk karakter kontrol edilir, yalnızca eşleşirse önekler tek bir startswith ile denenir
+diff_header_prefixes = ('diff --git', 'index ', '--- ', '+++ ')
+diff_header_first_chars = frozenset(prefix[0] for prefix in diff_header_prefixes)
+
+#Raporun stil tanımlarını içeren başlangıcı ve sonu sabit olduğu için modül yüklenirken bir kez oluşturulur
+#ve her çalıştırmada yeniden kodlanmamak için bayt olarak saklanır
+html_header = (
+    '<html><head><style>'
+    'body { font-family: Courier, monospace; }'
+    '.line-num { display: inline-block; width: 40px; }'
+    '.added { background-color: #eaffea; color: green; }'
+    '.removed { background-color: #ffecec; color: red; }'
+    'table { width: 100%; border-collapse: collapse; }'
+    'td, th { border: 1px solid #ddd; padding: 8px; vertical-align: top; white-space: pre-wrap; }'
+    'th { background-color: #f2f2f2; }'
+    '</style></head><body>'
+).encode('utf-8')
+html_footer = '</body></html>'.encode('utf-8')
+
+#pygit2 kuruluysa repoyu bir kez açar, aksi halde git komutları kullanılmaya devam edilir
+def open_repository(repo_path):
+    if pygit2 is None:
+        return None
     try:
-        result = subprocess.run(
-            ['git', '-C', repo_path, 'diff', f'-U{number_of_previous_rows}', commit1, commit2, '--', file_name],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8'
-        )
-        return result.stdout
+        return pygit2.Repository(repo_path)
     except Exception as e:
-        return str(e)
+        print(f"pygit2 could not open {repo_path}, falling back to git commands: {e}")
+        return None
+
+#"a/<dosya> b/<dosya>" biçimindeki diff --git başlığından dosya adını çıkarır.
+#'"', '\\', tab, kontrol karakteri veya ASCII dışı karakter içeren adlar başlıkta C tarzı tırnaklandığı için çözülür.
+def diff_header_file_name(header):
+    quoted = quoted_name_pattern.match(header)
+    if quoted:
+        name = quoted_escape_pattern.sub(lambda m: c_quote_escapes.get(m.group(1)) or bytes([int(m.group(1), 8)]), quoted.group(1))
+        return name[2:].decode('utf-8', errors='replace')
+    return header[2:2 + (len(header) - 5) // 2].decode('utf-8', errors='replace')
+
+#Verilen repo üzerinde çalışacak git komutunun argüman listesini oluşturur; tüm git süreçleri aynı ön eki kullanır
+def git_command(repo_path, *args):
+    return ['git', '-C', repo_path, *args]
+
+#Tek bir "git diff --raw -p" çağrısıyla iki versiyon arasında değişen kaynak dosyaların listesini ve farklılıklarını alır.
+#Çıktının başındaki --raw bölümü hemen okunur ve (durum, dosya adı, nesne kimliği) listesi olarak döndürülür. Farklılıklar ise
+#ikinci değer olan iteratör dolaşıldıkça git çıktısından okunur ve her dosya tamamlandığında (dosya adı, diff) olarak
+#döndürülür; böylece tüm diff hiçbir zaman aynı anda bellekte tutulmaz.
+#Yeniden adlandırmalar ayrı bir "D" ve "A" olarak listelenir (--no-renames), böylece her kayıtta tek bir dosya adı bulunur.
+#--raw bölümü -z ile okunur; aksi halde '"', '\\', tab, kontrol karakteri veya ASCII dışı karakter içeren adlar
+#C tarzı tırnaklanır ve repodaki dosya adıyla eşleşmez.
+#Dosyalar uzantılarına göre git tarafından pathspec ile seçilir ("*.py" her klasör derinliğinde eşleşir).
+#diff_header_file_name başlıkların "a/" ve "b/" ile başlamasına dayandığı için ön ekler açıkça verilir; böylece
+#kullanıcının diff.noprefix, diff.srcPrefix veya diff.dstPrefix ayarları başlıkları değiştirmez.
+def open_diff(commit1, commit2, repo_path):
+    if repository is not None:
+        try:
+            diff = repository.diff(commit1, commit2, context_lines=number_of_previous_rows)
+        except Exception as e:
+            print(f"Error getting diff between {commit1} and {commit2}: {e}")
+            return [], iter(())
+        #Eklenen dosyanın içeriği yeni, silinen dosyanınki eski tarafta olduğu için o taraftaki nesne kimliği saklanır
+        changed_files = [(delta.status_char(), delta.new_file.path, delta.new_file.id if delta.status_char() == 'A' else delta.old_file.id)
+                         for delta in diff.deltas if delta.new_file.path.endswith(source_extensions)]
+        file_diffs = ((patch.delta.new_file.path, patch.text) for patch in diff if patch.delta.new_file.path.endswith(source_extensions))
+        return changed_files, file_diffs
 
-#Bir git fonksiyonu olan show fonksiyonu ile commit'teki dosyaların içeriğini alır
-def get_file_content_at_commit(commit, repo_path, file_name):
     try:
-        result = subprocess.run(
-            ['git', '-C', repo_path, 'show', f'{commit}:{file_name}'],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8'
+        proc = subprocess.Popen(
+            git_command(repo_path, 'diff', '-z', '--raw', '--no-abbrev', '-p', '--src-prefix=a/', '--dst-prefix=b/', f'-U{number_of_previous_rows}', '--no-renames', commit1, commit2, '--', *[f'*{ext}' for ext in source_extensions]),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=1 << 20
         )
-        if result.stderr:
-            print(f"Error getting file content for {file_name} at {commit}: {result.stderr}")
-        return result.stdout
     except Exception as e:
-        return str(e)
+        print(f"Error getting diff between {commit1} and {commit2}: {e}")
+        return [], iter(())
+
+    #Çıktı bayt olarak okunur; metne çevirme satır satır değil, her dosyanın farklılığı için bir kez yapılır.
+    #-z ile --raw kayıtları NUL ile ayrılır ve bölüm boş bir kayıtla (\0\0) biter; farklılıklar ise yine satırlar
+    #halinde gelir. Bölüm satır satır, sonlandırıcı görülene kadar okunur (dosya adında satır sonu olabilir).
+    raw = b''
+    while b'\0\0' not in raw:
+        line = proc.stdout.readline()
+        if not line:
+            break
+        raw += line
+    raw, _, first_line = raw.partition(b'\0\0')
+
+    changed_files = []
+    records = raw.split(b'\0') #":<mod> <mod> <nesne> <nesne> <durum>" ve "<dosya>" kayıtları sırayla gelir
+    for info, file_name in zip(records[0::2], records[1::2]):
+        _, _, old_id, new_id, status = info.decode('ascii').split(' ')
+        changed_files.append((status, file_name.decode('utf-8', errors='replace'), new_id if status == 'A' else old_id))
+    return changed_files, read_file_diffs(proc, first_line)
+
+#open_diff ile başlatılan git diff çıktısının kalanını okuyarak her dosyanın farklılığını (dosya adı, diff) olarak döndürür.
+#first_line, --raw bölümüyle birlikte okunmuş olan ilk farklılık satırıdır.
+def read_file_diffs(proc, first_line):
+    with proc:
+        file_name = None
+        lines = []
+        for line in itertools.chain((first_line,), proc.stdout):
+            if line.startswith(b'diff --git '):
+                if file_name is not None:
+                    yield file_name, b''.join(lines).decode('utf-8', errors='replace')
+                file_name = diff_header_file_name(line[11:].rstrip(b'\n'))
+                lines = [line]
+            else:
+                lines.append(line)
+        if file_name is not None:
+            yield file_name, b''.join(lines).decode('utf-8', errors='replace')
+
+#git cat-file --batch ile istenen tüm (commit, dosya, nesne kimliği) içeriklerini tek bir git süreci üzerinden okur.
+#İçerikler diff'ten gelen nesne kimliğiyle okunur; dosya yolu her dosya için commit ağacında yeniden aranmaz.
+#Tüm istekler tek seferde gönderilir ve cevaplar birlikte okunur; her dosya için git'in cevabı beklenmez.
+def get_file_contents_at_commits(requests, repo_path):
+    contents = {}
+    if not requests:
+        return contents
+    if repository is not None:
+        for commit, file_name, object_id in requests:
+            try:
+                data = repository[object_id].data
+                contents[(commit, file_name)] = data.decode('utf-8', errors='replace')
+            except Exception as e:
+                print(f"Error getting file content for {file_name} at {commit}: {e}")
+                contents[(commit, file_name)] = ''
+        return contents
+
+    try:
+        with subprocess.Popen(
+            git_command(repo_path, 'cat-file', '--batch'),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        ) as proc:
+            #communicate stdin'e yazarken stdout'u da okuduğu için git'in çıktı tamponu dolsa bile kilitlenme olmaz
+            #İstekler dosya adı yerine nesne kimliğiyle gönderildiği için adında satır sonu olan dosyalar da okunabilir
+            output, _ = proc.communicate(''.join(f'{object_id}\n' for _, _, object_id in requests).encode('ascii'))
+        position = 0
+        for commit, file_name, _ in requests:
+            header_end = output.find(b'\n', position)
+            if header_end == -1: #git beklenenden önce sonlandıysa kalan dosyalar boş kabul edilir
+                print(f"Error getting file content for {file_name} at {commit}: no response")
+                contents[(commit, file_name)] = ''
+                continue
+            header = output[position:header_end].decode('utf-8', errors='replace')
+            position = header_end + 1
+            parts = header.split(' ')
+            if len(parts) != 3 or not parts[2].isdigit(): #"<nesne> missing" gibi bir cevap döndüyse
+                print(f"Error getting file content for {file_name} at {commit}: {header}")
+                contents[(commit, file_name)] = ''
+                continue
+            size = int(parts[2])
+            contents[(commit, file_name)] = output[position:position + size].decode('utf-8', errors='replace')
+            position += size + 1 #İçeriğin sonundaki satır sonu karakteri atlanır
+    except Exception as e:
+        print(f"Error getting file contents: {e}")
+    return contents
+
+#Metni satır listesi oluşturmadan satır satır dolaşır; büyük diff'lerde splitlines() kadar ek bellek ayırmaz.
+#(io.StringIO metni karakter başına 4 bayt olarak kopyaladığı için burada daha fazla bellek kullanır.)
+def iter_lines(text):
+    start = 0
+    end = text.find('\n')
+    while end != -1:
+        if end > start and text[end - 1] == '\r': #Windows satır sonlarında \r de atılır
+            yield text[start:end - 1]
+        else:
+            yield text[start:end]
+        start = end + 1
+        end = text.find('\n', start)
+    if start < len(text):
+        yield text[start:]
 
 def extract_function_names(diff):
-    function_names = set()
-    pattern = re.compile(r'^@@.*@@\s*(def|function)\\s*([a-zA-Z_][a-zA-Z0-9_]*)')
-    for line in diff.splitlines():
-        match = pattern.match(line)
-        if match:
-            function_names.add(match.group(2))
-    return function_names
+    return set(function_name_pattern.findall(diff))
+
+#Düzenlenen bir dosyanın diff çıktısını tablo satırlarına çevirir; en sık çalışan döngü olduğu için
+#global isimler yerel değişkenlere bağlanır. Satırların listesini ve farklılık sayısını döndürür.
+def render_diff_rows(diff):
+    rows = []
+    append = rows.append
+    match_hunk = hunk_header_pattern.match
+    header_prefixes = diff_header_prefixes
+    header_first_chars = diff_header_first_chars
+    difference_count = 0
+    old_line_num = 0
+    new_line_num = 0
+
+    #Satır satır kaçırmak yerine tüm diff tek seferde kaçırılır; başlık ve hunk satırlarındaki
+    #işaretler (+, -, @@, diff --git ...) kaçırılacak karakterleri içermediği için etkilenmez
+    #Satırlar bilerek f-string ile oluşturulur: CPython 3.11'de "%" biçimlendirmeden yaklaşık iki kat hızlıdır
+    for line in iter_lines(html.escape(diff)):
+        first_char = line[:1]
+        if first_char in header_first_chars and line.startswith(header_prefixes):
+            continue
+        if first_char == '@':
+            old_line_num, new_line_num = map(int, match_hunk(line).groups())
+            append('<tr><td colspan="2"><hr></td></tr>')
+        elif first_char == '+':
+            difference_count += 1
+            append(f'<tr><td class="removed"><pre><span class="line-num">{old_line_num}</span> - {line[1:]}</pre></td><td></td></tr>')
+            old_line_num += 1
+        elif first_char == '-':
+            difference_count += 1
+            append(f'<tr><td></td><td class="added"><pre><span class="line-num">{new_line_num}</span> + {line[1:]}</pre></td></tr>')
+            new_line_num += 1
+        else:
+            append(f'<tr><td><pre><span class="line-num">{old_line_num}</span> {line}</pre></td><td><pre><span class="line-num">{new_line_num}</span> {line}</pre></td></tr>')
+            old_line_num += 1
+            new_line_num += 1
+
+    return rows, difference_count
+
+#Eklenen bir dosyanın tüm satırlarını "New Version" tablosuna yazdırır
+def render_added(out, diff_data):
+    file_name = diff_data['file_name']
+    append = out.append
+    append(f'<p><b>File added: {html.escape(file_name)}</b></p>')
+    append('<table><tr><th>New Version</th></tr><tr><td class="added"><pre>')
+    for i, line in enumerate(iter_lines(html.escape(diff_data['file_content'])), 1): #İçerik tek seferde kaçırılır, girintiler korunur
+        append(f'<span class="line-num">{i}</span> + {line}\n')
+    append('</pre></td></tr></table>')
+
+#Silinen bir dosyanın tüm satırlarını "Old Version" tablosuna yazdırır
+def render_deleted(out, diff_data):
+    file_name = diff_data['file_name']
+    append = out.append
+    append(f'<p><b>File deleted: {html.escape(file_name)}</b></p>')
+    append('<table><tr><th>Old Version</th></tr><tr><td class="removed"><pre>')
+    for i, line in enumerate(iter_lines(html.escape(diff_data['file_content'])), 1): #İçerik tek seferde kaçırılır, girintiler korunur
+        append(f'<span class="line-num">{i}</span> - {line}\n')
+    append('</pre></td></tr></table>')
+
+#Düzenlenen bir dosyanın farklılık sayısını, fonksiyonlarını ve iki sütunlu farklılık tablosunu yazdırır
+def render_edited(out, diff_data):
+    diff = diff_data['diff']
+    rows, difference_count = render_diff_rows(diff)
+    function_names = extract_function_names(diff)
+
+    append = out.append
+    append(f'<p><b>Farklılık Sayısı: {difference_count}</b></p>')
+    append(f'<p><b>Farklılık Olan Fonksiyonlar: {", ".join(function_names)}</b></p>')
+
+    append('<table><tr><th>Old Version</th><th>New Version</th></tr>')
+    out.extend(rows)
+    append('</table>')
+
+#Dosya durumuna göre kullanılacak yazdırma fonksiyonu. Farklılıklar her iki modda da yeni commit'ten eskiye doğru
+#alındığı için "A" yalnızca eski versiyonda bulunan (silinen), "D" ise yalnızca yeni versiyonda bulunan (eklenen) dosyadır.
+file_renderers = {'A': render_deleted, 'D': render_added, '': render_edited}
 
 #Farklılıkların yazdırıldığı fonksiyon
 def write_diff_to_html(diffs, output_file):
+    #Yalnızca dosyanın açılması try bloğunda tutulur; yazdırma döngüsü istisna yakalama bloğunun dışında çalışır
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('<html><head><style>')
-            f.write('body { font-family: Courier, monospace; }')
-            f.write('.line-num { display: inline-block; width: 40px; }')
-            f.write('.added { background-color: #eaffea; color: green; }')
-            f.write('.removed { background-color: #ffecec; color: red; }')
-            f.write('table { width: 100%; border-collapse: collapse; }')
-            f.write('td, th { border: 1px solid #ddd; padding: 8px; vertical-align: top; white-space: pre-wrap; }')
-            f.write('th { background-color: #f2f2f2; }')
-            f.write('</style></head><body>')
-
-            for diff_data in diffs:
-                diff = diff_data['diff']
-                file_name = diff_data['file_name']
-                file_status = diff_data['file_status']
-                file_content = diff_data['file_content']
-
-                f.write(f'<h2>{html.escape(file_name)} Dosyasındaki Farklılıklar:</h2>')
-
-                if oneArgument: #Tek commit seçildiyse
-                    if file_status == 'A': #Eğer dosya "Added File" olarak nitelendirilmiş ise
-                        f.write(f'<p><b>File added: {html.escape(file_name)}</b></p>')
-                        f.write('<table><tr><th>New Version</th></tr><tr><td class="added"><pre>')
-                        for i, line in enumerate(file_content.splitlines(), 1):
-                            f.write(f'<span class="line-num">{i}</span> + {html.escape(line.strip())}\n')
-                        f.write('</pre></td></tr></table>')
-                    elif file_status == 'D': #Eğer dosya "Deleted File" olarak nitelendirilmişse 
-                        f.write(f'<p><b>File deleted: {html.escape(file_name)}</b></p>')
-                        f.write('<table><tr><th>Old Version</th></tr><tr><td class="removed"><pre>')
-                        for i, line in enumerate(file_content.splitlines(), 1):
-                            f.write(f'<span class="line-num">{i}</span> - {html.escape(line.strip())}\n')
-                        f.write('</pre></td></tr></table>')
-                    else: #Dosya "Editted File" ise
-                        lines = diff.splitlines()
-                        lines = [line for line in lines if not (line.startswith('diff --git') or line.startswith('index ') or line.startswith('--- ') or line.startswith('+++ '))]
-                        difference_count = sum(1 for line in lines if line.startswith('-') or line.startswith('+'))
-                        function_names = extract_function_names(diff)
-
-                        f.write(f'<p><b>Farklılık Sayısı: {difference_count}</b></p>')
-                        f.write(f'<p><b>Farklılık Olan Fonksiyonlar: {", ".join(function_names)}</b></p>')
-
-                        f.write('<table><tr><th>Old Version</th><th>New Version</th></tr>')
-
-                        old_line_num = 0
-                        new_line_num = 0
-
-                        for line in lines:
-                            if line.startswith('@@'):
-                                parts = line.split(' ')
-                                old_line_num = int(parts[1].split(',')[0][1:])
-                                new_line_num = int(parts[2].split(',')[0][1:])
-                                f.write('<tr><td colspan="2"><hr></td></tr>')
-                            elif line.startswith('+'):
-                                f.write(f'<tr><td class="removed"><pre><span class="line-num">{old_line_num}</span> - {html.escape(line[1:])}</pre></td><td></td></tr>')
-                                old_line_num += 1
-                            elif line.startswith('-'):
-                                f.write(f'<tr><td></td><td class="added"><pre><span class="line-num">{new_line_num}</span> + {html.escape(line[1:])}</pre></td></tr>')
-                                new_line_num += 1
-                            else:
-                                f.write(f'<tr><td><pre><span class="line-num">{old_line_num}</span> {html.escape(line)}</pre></td><td><pre><span class="line-num">{new_line_num}</span> {html.escape(line)}</pre></td></tr>')
-                                old_line_num += 1
-                                new_line_num += 1
-                        f.write('</table>')
-
-                else: #İki commit seçildiyse
-                    if file_status == 'D':
-                        f.write(f'<p><b>File added: {html.escape(file_name)}</b></p>')
-                        f.write('<table><tr><th>New Version</th></tr><tr><td class="added"><pre>')
-                        for i, line in enumerate(file_content.splitlines(), 1):
-                            f.write(f'<span class="line-num">{i}</span> + {html.escape(line.strip())}\n')
-                        f.write('</pre></td></tr></table>')
-                    elif file_status == 'A':
-                        f.write(f'<p><b>File deleted: {html.escape(file_name)}</b></p>')
-                        f.write('<table><tr><th>Old Version</th></tr><tr><td class="removed"><pre>')
-                        for i, line in enumerate(file_content.splitlines(), 1):
-                            f.write(f'<span class="line-num">{i}</span> - {html.escape(line.strip())}\n')
-                        f.write('</pre></td></tr></table>')
-                    else:
-                        lines = diff.splitlines()
-                        lines = [line for line in lines if not (line.startswith('diff --git') or line.startswith('index ') or line.startswith('--- ') or line.startswith('+++ '))]
-                        difference_count = sum(1 for line in lines if line.startswith('-') or line.startswith('+'))
-                        function_names = extract_function_names(diff)
-
-                        f.write(f'<p><b>Farklılık Sayısı: {difference_count}</b></p>')
-                        f.write(f'<p><b>Farklılık Olan Fonksiyonlar: {", ".join(function_names)}</b></p>')
-
-                        f.write('<table><tr><th>Old Version</th><th>New Version</th></tr>')
-
-                        old_line_num = 0
-                        new_line_num = 0
-
-                        for line in lines:
-                            if line.startswith('@@'):
-                                parts = line.split(' ')
-                                old_line_num = int(parts[1].split(',')[0][1:])
-                                new_line_num = int(parts[2].split(',')[0][1:])
-                                f.write('<tr><td colspan="2"><hr></td></tr>')
-                            elif line.startswith('+'):
-                                f.write(f'<tr><td class="removed"><pre><span class="line-num">{old_line_num}</span> - {html.escape(line[1:])}</pre></td><td></td></tr>')
-                                old_line_num += 1
-                            elif line.startswith('-'):
-                                f.write(f'<tr><td></td><td class="added"><pre><span class="line-num">{new_line_num}</span> + {html.escape(line[1:])}</pre></td></tr>')
-                                new_line_num += 1
-                            else:
-                                f.write(f'<tr><td><pre><span class="line-num">{old_line_num}</span> {html.escape(line)}</pre></td><td><pre><span class="line-num">{new_line_num}</span> {html.escape(line)}</pre></td></tr>')
-                                old_line_num += 1
-                                new_line_num += 1
-
-                        f.write('</table>')
-            f.write('</body></html>')
+        f = open(output_file, 'wb', buffering=1 << 20) #Çıktı 1 MiB tampon ile, önceden kodlanmış bayt olarak yazılır
     except Exception as e:
         print(f"HTML dosyasına yazarken hata oluştu: {e}")
+        return
 
-def get_changed_files(commit1, commit2, repo_path):
-    try:
-        result = subprocess.run(
-            ['git', '-C', repo_path, 'diff', '--name-status', commit1, commit2],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8'
-        )
-        return result.stdout.splitlines()
-    except Exception as e:
-        return str(e)
+    with f:
+        #HTML parçaları bir listede biriktirilir ve her dosya için ''.join ile birleştirilip tek bir write ile yazılır.
+        #Parçaları html += ... ile birleştirmek büyük çıktılarda her eklemede yeniden kopyalamaya (O(N²)) yol açabilir.
+        out = []
+        append = out.append
+        f.write(html_header)
 
-def get_commit_diff(commit, repo_path):
-    try:
-        result = subprocess.run(
-            ['git', '-C', repo_path, 'diff-tree', '--no-commit-id', '--name-status', '-r', commit],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8'
-        )
-        return result.stdout.splitlines()
-    except Exception as e:
-        return str(e)
+        for diff_data in diffs:
+            file_name = diff_data['file_name']
+            append(f'<h2>{html.escape(file_name)} Dosyasındaki Farklılıklar:</h2>')
+
+            file_renderers[diff_data['file_status']](out, diff_data)
+
+            f.write(''.join(out).encode('utf-8')) #Bellek kullanımını sınırlamak için her dosyanın çıktısı ayrı yazılır
+            out.clear()
+
+        f.write(html_footer)
+
+#write_diff_to_html'e verilecek dosya verilerini değişen dosyaların sırasıyla üretir.
+#file_diffs, git'in dosyaları listelediği sırayla (dosya adı, diff) döndüren bir iteratördür. Eklenen ve silinen
+#dosyaların da farklılığı bulunduğu için listede daha önce geçen dosyalara ait farklılıklar atlanır; listede daha sonra
+#gelen bir dosyanın farklılığı ise atılmaz, o dosyaya sıra gelene kadar bekletilir.
+def iter_diff_data(source_files, file_diffs, content_commits, get_file_contents):
+    remaining = {file_name for _, file_name, _ in source_files} #Henüz sırası gelmemiş dosyalar
+    pending = None
+    for status, file_name, _ in source_files:
+        remaining.discard(file_name)
+        if status in content_commits:
+            file_content = get_file_contents().get((content_commits[status], file_name), '')
+            yield {'diff': '', 'file_name': file_name, 'file_status': status, 'file_content': file_content}
+            continue
+
+        diff = ''
+        while True:
+            if pending is None:
+                pending = next(file_diffs, None)
+                if pending is None:
+                    break
+            diff_file_name, file_diff = pending
+            if diff_file_name in remaining: #Listede sonra gelen bir dosyaya ait; bu dosyanın farklılığı yok
+                break
+            pending = None
+            if diff_file_name == file_name:
+                diff = file_diff
+                break
+        yield {'diff': diff, 'file_name': file_name, 'file_status': '', 'file_content': ''}
 
 #
 def convert_path(path):
     return path.replace('\\', '/')
 
+#Var olan klasör adları tek bir os.scandir ile okunur ve ilk boş "<klasör> (n)" adı bellekte bulunur
 def create_unique_output_dir(base_dir):
-    counter = 1
-    new_dir = base_dir
-    while os.path.exists(new_dir):
-        new_dir = f"{base_dir} ({counter})"
-        counter += 1
-    os.makedirs(new_dir)
-    return new_dir
+    parent, base = os.path.split(base_dir)
+    try:
+        taken = {entry.name for entry in os.scandir(parent or '.') if entry.name.startswith(base)}
+    except FileNotFoundError:
+        taken = set()
+
+    counter = 0
+    name = base
+    while True:
+        while name in taken:
+            counter += 1
+            name = f"{base} ({counter})"
+        new_dir = os.path.join(parent, name)
+        try:
+            os.makedirs(new_dir)
+            return new_dir
+        except FileExistsError: #Klasör bu arada başka bir işlem tarafından oluşturulduysa bir sonraki ad denenir
+            taken.add(name)
 
 if __name__ == "__main__":
     if len(sys.argv) < 4 or len(sys.argv) > 5:
@@ -196,12 +360,10 @@ if __name__ == "__main__":
     
     commit1 = sys.argv[1]
     if len(sys.argv) == 5:
-        oneArgument = False
         commit2 = sys.argv[2]
         repo_path = convert_path(sys.argv[3])
         output_dir = convert_path(sys.argv[4])
     else:
-        oneArgument = True
         commit2 = None
         repo_path = convert_path(sys.argv[2])
         output_dir = convert_path(sys.argv[3])
@@ -209,39 +371,30 @@ if __name__ == "__main__":
     print(f"Converted repo_path: {repo_path}")
     print(f"Converted output_dir: {output_dir}")
 
+    repository = open_repository(repo_path)
+
     differences_dir = create_unique_output_dir(os.path.join(output_dir, "Differences"))
     output_file = os.path.join(differences_dir, "combined_diff.html")
 
-    if commit2:
-        changed_files = get_changed_files(commit1, commit2, repo_path)
+    base_commit = commit2 if commit2 else commit1 + '^' #Tek commit seçildiyse bir önceki versiyon ile karşılaştırılır
+    content_commits = {'A': base_commit, 'D': commit1} #Yalnızca bir versiyonda bulunan dosyaların içeriğinin okunacağı commit'ler
+
+    #Değişen kaynak dosyaların listesi ve farklılıkları tek bir git süreciyle alınır; uzantı seçimi open_diff içinde yapılır.
+    #Dosya adları -z kayıtlarından tırnaklanmadan alındığı için liste burada yeniden süzülmez.
+    source_files, file_diffs = open_diff(commit1, base_commit, repo_path)
+
+    #Dosya içerikleri tek bir git cat-file süreci ile alınır.
+    #İçerikler arka planda okunurken farklılıklar git diff çıktısı geldikçe HTML dosyasına yazılır;
+    #pygit2 repo nesnesi thread'ler arasında paylaşılmadığı için bu durumda içerikler ana thread'de okunur.
+    content_requests = [(content_commits[status], file_name, object_id) for status, file_name, object_id in source_files if status in content_commits]
+    if repository is not None:
+        contents = get_file_contents_at_commits(content_requests, repo_path)
+        diffs = iter_diff_data(source_files, file_diffs, content_commits, lambda: contents)
+        write_diff_to_html(diffs, output_file)
     else:
-        changed_files = get_commit_diff(commit1, repo_path)
-
-    diffs = []
-    for line in changed_files:
-        status, file_name = line.split(maxsplit=1)
-        if file_name.endswith('.c') or file_name.endswith('.h') or file_name.endswith('.py'):
-            if commit2:
-                if status == 'A':
-                    file_content = get_file_content_at_commit(commit2, repo_path, file_name)
-                    diffs.append({'diff': '', 'file_name': file_name, 'file_status': 'A', 'file_content': file_content})
-                elif status == 'D':
-                    file_content = get_file_content_at_commit(commit1, repo_path, file_name)
-                    diffs.append({'diff': '', 'file_name': file_name, 'file_status': 'D', 'file_content': file_content})
-                else:
-                    diff = get_git_diff(commit1, commit2, repo_path, file_name)
-                    diffs.append({'diff': diff, 'file_name': file_name, 'file_status': '', 'file_content': ''})
-            else:
-                if status == 'A':
-                    file_content = get_file_content_at_commit(commit1, repo_path, file_name)
-                    diffs.append({'diff': '', 'file_name': file_name, 'file_status': 'A', 'file_content': file_content})
-                elif status == 'D':
-                    file_content = get_file_content_at_commit(commit1, repo_path, file_name)
-                    diffs.append({'diff': '', 'file_name': file_name, 'file_status': 'D', 'file_content': file_content})
-                else:
-                    diff = get_git_diff(commit1, commit1 + '^', repo_path, file_name)
-                    diffs.append({'diff': diff, 'file_name': file_name, 'file_status': '', 'file_content': ''})
-
-    write_diff_to_html(diffs, output_file)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            contents_future = executor.submit(get_file_contents_at_commits, content_requests, repo_path)
+            diffs = iter_diff_data(source_files, file_diffs, content_commits, contents_future.result)
+            write_diff_to_html(diffs, output_file)
 
     print(f"Farklılıklar {differences_dir} klasöründe combined_diff.html olarak yazıldı.")